@@ -0,0 +1,144 @@
+"""Cek bahwa mode streaming report.py sama dengan mode in-memory.
+
+Data acak dibuat dengan sel kosong (missing value) di semua kolom, lalu
+summary setiap periode dihitung dengan kedua mode dan dibandingkan, begitu
+juga titik dan ukuran peta users dari bin peta per hari. Angka
+float dibandingkan dengan toleransi relatif karena urutan penjumlahan per
+chunk berbeda. Keluar dengan kode 1 jika ada periode yang berbeda.
+
+Contoh:
+    python check_streaming.py --orders 20000 --missing-rate 0.03 --chunksize 997
+"""
+import argparse
+import math
+import sys
+import tempfile
+
+import report
+from helpers import filter_data, encode_map_points, plot_users_map
+from load_test import generate_dataset
+
+## Bandingkan dua nilai summary, kembalikan daftar path yang berbeda
+def compare_values(expected, actual, path="", rel_tol=1e-9):
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        if expected.keys() != actual.keys():
+            return [f"{path}: key {sorted(expected)} != {sorted(actual)}"]
+        return [
+            diff
+            for key in expected
+            for diff in compare_values(expected[key], actual[key], f"{path}.{key}", rel_tol)
+        ]
+
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return [f"{path}: panjang {len(expected)} != {len(actual)}"]
+        return [
+            diff
+            for i, (x, y) in enumerate(zip(expected, actual))
+            for diff in compare_values(x, y, f"{path}[{i}]", rel_tol)
+        ]
+
+    if isinstance(expected, float) and isinstance(actual, (int, float)):
+        if math.isclose(expected, actual, rel_tol=rel_tol):
+            return []
+    elif expected == actual:
+        return []
+
+    return [f"{path}: {expected!r} != {actual!r}"]
+
+## Summary semua periode untuk data yang sedang dimuat
+def create_summaries(data, periods):
+    report.init_worker(data)
+
+    return {
+        name: report.create_summary(name, start_date, end_date, report.compute_report_data(start_date, end_date))
+        for name, start_date, end_date in periods
+    }
+
+## Titik peta (diurutkan) dan map_stats per periode
+def create_memory_maps(data, periods):
+    maps = {}
+
+    for name, start_date, end_date in periods:
+        customers_df = filter_data(data['customers'], start_date, end_date, data['calendar'])
+        sellers_df = filter_data(data['sellers'], start_date, end_date, data['calendar'])
+
+        maps[name] = {
+            'customer_points': sort_points(encode_map_points(customers_df)),
+            'seller_points': sort_points(encode_map_points(sellers_df)),
+            'map_stats': plot_users_map(customers_df, sellers_df)[1],
+        }
+
+    return maps
+
+def create_stream_maps(data, periods):
+    maps = {}
+
+    for name, start_date, end_date in periods:
+        aggregates = data['rollups'].period(start_date, end_date)
+
+        maps[name] = {
+            'customer_points': sort_points(aggregates.customer_points),
+            'seller_points': sort_points(aggregates.seller_points),
+            'map_stats': aggregates.users_map()[1],
+        }
+
+    return maps
+
+def sort_points(points):
+    return points.sort_values(by=['x', 'y']).to_dict(orient='list')
+
+def check_streaming(data_dir, freqs, chunksize):
+    memory_data = report.load_data(data_dir)
+    periods = report.generate_periods(
+        memory_data['calendar']['date'].iat[0],
+        memory_data['calendar']['date'].iat[-1],
+        freqs
+    )
+
+    stream_data = report.load_stream_data(data_dir, chunksize)
+
+    expected = create_summaries(memory_data, periods)
+    actual = create_summaries(stream_data, periods)
+
+    expected_maps = create_memory_maps(memory_data, periods)
+    actual_maps = create_stream_maps(stream_data, periods)
+
+    for name in expected:
+        expected[name]['users_map'] = expected_maps[name]
+        actual[name]['users_map'] = actual_maps[name]
+
+    return {
+        name: diffs
+        for name in expected
+        if (diffs := compare_values(expected[name], actual[name]))
+    }
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Bandingkan mode streaming dan in-memory report.py.")
+    parser.add_argument("--orders", type=int, default=20_000, help="Jumlah order pada data acak")
+    parser.add_argument("--missing-rate", type=float, default=0.03, help="Proporsi sel yang dikosongkan")
+    parser.add_argument("--chunksize", type=int, default=997, help="Ukuran chunk mode streaming")
+    parser.add_argument("--freq", nargs="+", default=["Q", "Y"], help="Frekuensi periode yang dibandingkan")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        generate_dataset(data_dir, n_orders=args.orders, seed=args.seed, missing_rate=args.missing_rate)
+        mismatches = check_streaming(data_dir, args.freq, args.chunksize)
+
+    for name, diffs in mismatches.items():
+        print(f"[{name}] {len(diffs)} nilai berbeda", file=sys.stderr)
+        for diff in diffs[:10]:
+            print(f"    {diff}", file=sys.stderr)
+
+    if mismatches:
+        sys.exit(1)
+
+    print("Mode streaming sama dengan mode in-memory untuk semua periode.")
+
+if __name__ == "__main__":
+    main()
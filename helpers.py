@@ -0,0 +1,597 @@
+import json
+from dataclasses import dataclass
+
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+import seaborn as sns
+import pydeck as pdk
+from babel.numbers import get_currency_symbol
+from matplotlib.ticker import FuncFormatter
+from pydeck.bindings.json_tools import default_serialize
+
+sns.set_style("white")
+
+DATETIME_COLUMNS = [
+    "order_purchase_timestamp",
+    "order_approved_at",
+    "order_delivered_carrier_date",
+    "order_delivered_customer_date",
+    "order_estimated_delivery_date",
+    "shipping_limit_date"
+]
+
+# Kolom kalender untuk setiap periode tren
+TREND_BUCKETS = {
+    'W': 'week',
+    'M': 'month',
+    'Q': 'quarter',
+    'Y': 'year',
+}
+
+# day_id untuk baris tanpa tanggal transaksi
+NO_DAY_ID = np.iinfo(np.int32).min
+
+# PENGOLAHAN DATA ----------
+## Ubah kolom tanggal ke tipe datetime
+def parse_datetime_columns(data_df):
+    for col in DATETIME_COLUMNS:
+        if col in data_df.columns:
+            data_df[col] = pd.to_datetime(data_df[col], errors='coerce')
+
+    return data_df
+
+## Dataset
+def load_dataset(data_path):
+    data_df = parse_datetime_columns(pd.read_csv(data_path))
+
+    if "order_purchase_timestamp" in data_df.columns:
+        data_df = data_df.sort_values(by='order_purchase_timestamp')
+
+    return data_df
+
+## Tabel kalender: satu baris per hari dengan ID dan label bucket tren
+def create_calendar(min_date, max_date):
+    days = pd.date_range(pd.Timestamp(min_date).normalize(), pd.Timestamp(max_date).normalize(), freq='D')
+
+    # Minggu berakhir hari Minggu, sama dengan resample 'W'
+    week_end = days + pd.to_timedelta(6 - days.dayofweek, unit='D')
+
+    calendar_df = pd.DataFrame({
+        'date': days,
+        'week_id': week_end.to_numpy().astype('datetime64[D]').astype(np.int64) // 7,
+        'month_id': days.year * 12 + days.month - 1,
+        'quarter_id': days.year * 4 + days.quarter - 1,
+        'year_id': days.year,
+        'week_label': week_end.strftime('W-%U %Y'),
+        'month_label': days.strftime('%b %y'),
+        'quarter_label': 'Q' + days.quarter.astype(str) + ' ' + days.year.astype(str),
+        'year_label': days.year.astype(str),
+    })
+
+    return calendar_df
+
+## Posisi tanggal di tabel kalender
+def get_day_id(calendar_df, date):
+    return (pd.Timestamp(date) - calendar_df['date'].iat[0]).days
+
+## Tambahkan kolom day_id (posisi hari transaksi di kalender)
+def add_day_id(df, calendar_df):
+    day_id = (df['order_purchase_timestamp'].dt.normalize() - calendar_df['date'].iat[0]).dt.days
+    df['day_id'] = day_id.fillna(NO_DAY_ID).astype(np.int32)
+
+    return df
+
+## Filter data berdasarkan periode (df harus punya kolom day_id dari add_day_id)
+def filter_data(df, start_date, end_date, calendar_df):
+    # Bandingkan day_id (integer) tanpa konversi tanggal per baris
+    day_id = df['day_id']
+    filtered_data_df = df[
+        (day_id >= max(get_day_id(calendar_df, start_date), NO_DAY_ID + 1)) &
+        (day_id <= get_day_id(calendar_df, end_date))
+    ].copy()
+
+    return filtered_data_df
+
+# HELPER FUNCTIONS ----------
+## Formating angka metrik
+def format_curr_short(value: float, currency: str = "BRL", locale:str = "pt_BR", decimals: int = 2) -> str:
+    symbol = get_currency_symbol(currency, locale=locale)
+
+    if value >= 1_000_000_000:
+        short = f"{value / 1_000_000_000:.{decimals}f} B"
+    elif value >= 1_000_000:
+        short = f"{value / 1_000_000:.{decimals}f} M"
+    elif value >= 1_000:
+        short = f"{value / 1_000:.{decimals}f} K"
+    else:
+        short = f"{value:,.0f}"
+
+    return f"{symbol}{short}"
+
+## KPI halaman Sales
+@dataclass(frozen=True)
+class SalesKPI:
+    total_sales: float
+    avg_sales: float
+    total_orders: int
+    order_per_cus: float
+    delivery_success_rate: float
+    avg_delivery_days: float
+    delivery_late_rate: float
+    avg_review: float
+
+## Lama pengiriman per baris dalam hari (dibulatkan ke bawah seperti .dt.days)
+def compute_delivery_days(df):
+    nat = np.iinfo(np.int64).min
+    day_ns = 86_400 * 10**9
+    purchase = df['order_purchase_timestamp'].to_numpy(dtype='datetime64[ns]').view('i8')
+    delivered_at = df['order_delivered_customer_date'].to_numpy(dtype='datetime64[ns]').view('i8')
+    estimated_at = df['order_estimated_delivery_date'].to_numpy(dtype='datetime64[ns]').view('i8')
+
+    valid_delivered = (purchase != nat) & (delivered_at != nat)
+    valid_estimated = (purchase != nat) & (estimated_at != nat)
+    days_to_delivered = np.where(valid_delivered, delivered_at - purchase, 0) // day_ns
+    estimated_days = np.where(valid_estimated, estimated_at - purchase, 0) // day_ns
+
+    # Late jika selisih estimasi < 0 atau tidak diketahui (NaT)
+    not_late = valid_delivered & valid_estimated & (estimated_days >= days_to_delivered)
+
+    return days_to_delivered, valid_delivered, not_late
+
+## Hitung semua KPI Sales dalam satu kali baca per kolom
+def create_sales_kpi(df) -> SalesKPI:
+    n_rows = len(df)
+    n_rows_div = n_rows or np.nan
+
+    payment = df['payment_value'].to_numpy(dtype=float)
+    review = df['review_score'].to_numpy(dtype=float)
+
+    total_orders = int(df['order_id'].notna().sum())
+    num_customer = df['customer_id'].nunique()
+    delivered = int((df['order_status'].to_numpy() == 'delivered').sum())
+
+    days_to_delivered, valid_delivered, not_late = compute_delivery_days(df)
+
+    n_delivered = valid_delivered.sum()
+    avg_delivery_days = days_to_delivered[valid_delivered].sum() / n_delivered if n_delivered else np.nan
+    n_late = n_rows - int(not_late.sum())
+
+    payment_valid = ~np.isnan(payment)
+    review_valid = ~np.isnan(review)
+    total_sales = float(payment[payment_valid].sum())
+    n_payment = payment_valid.sum()
+    n_review = review_valid.sum()
+
+    return SalesKPI(
+        total_sales=total_sales,
+        avg_sales=total_sales / n_payment if n_payment else np.nan,
+        total_orders=total_orders,
+        order_per_cus=total_orders / num_customer if num_customer else np.nan,
+        delivery_success_rate=delivered / n_rows_div * 100,
+        avg_delivery_days=float(avg_delivery_days),
+        delivery_late_rate=n_late / n_rows_div * 100,
+        avg_review=float(review[review_valid].sum() / n_review) if n_review else np.nan,
+    )
+
+## Fungsi untuk membuat DataFrame tren penjualan
+def create_sales_trend_df(df, periode: str, calendar_df):
+    if periode not in TREND_BUCKETS:
+        raise ValueError("Periode tidak valid!")
+
+    # Kelompokkan berdasarkan ID bucket dari kalender
+    day_id = df['day_id'].to_numpy()
+    valid = (day_id >= 0) & (day_id < len(calendar_df))
+    bucket_id = calendar_df[f"{TREND_BUCKETS[periode]}_id"].to_numpy()[day_id[valid]]
+
+    bucket_df = (
+        pd.DataFrame({
+            'bucket_id': bucket_id,
+            'order_id': df['order_id'].to_numpy()[valid],
+            'payment_value': df['payment_value'].to_numpy()[valid],
+        })
+        .groupby('bucket_id')
+        .agg(
+            total_orders=('order_id', 'nunique'),
+            total_sales=('payment_value', 'sum')
+        )
+    )
+
+    return create_trend_from_buckets(bucket_df, periode, calendar_df)
+
+## Lengkapi bucket kosong dan tambahkan label dari kalender
+def create_trend_from_buckets(bucket_df, periode: str, calendar_df):
+    bucket = TREND_BUCKETS[periode]
+
+    if bucket_df.empty:
+        return pd.DataFrame(columns=['order_purchase_timestamp', 'total_orders', 'total_sales'])
+
+    # Bucket tanpa transaksi tetap ditampilkan dengan nilai 0 (seperti resample)
+    sales_trend_df = bucket_df.reindex(
+        range(bucket_df.index.min(), bucket_df.index.max() + 1),
+        fill_value=0
+    )
+
+    labels = calendar_df.drop_duplicates(f"{bucket}_id").set_index(f"{bucket}_id")[f"{bucket}_label"]
+    sales_trend_df.insert(0, 'order_purchase_timestamp', labels.reindex(sales_trend_df.index).to_numpy())
+
+    return sales_trend_df.reset_index(drop=True)
+
+## Formating angka y_axis tren penjualan
+def axis_formatter(x, pos):
+    if x >= 1_000_000_000:
+        return f"{x / 1_000_000_000:.1f}B"
+    elif x >= 1_000_000:
+        return f"{x / 1_000_000:.1f}M"
+    elif x >= 1_000:
+        return f"{x / 1_000:.1f}K"
+    else:
+        return f"{x:,.0f}"
+
+## Visualisasi tren penjualan
+def sales_trend_viz(x, y, xlabel: str):
+    fig, ax = plt.subplots(figsize=(12, 5))
+
+    # Plot di posisi integer, label bucket dipasang sekali sebagai tick
+    positions = np.arange(len(x))
+    ax.plot(positions, y, marker='o', linewidth=2, markersize=5, color="#6EC6BF")
+    ax.set_xticks(positions, labels=list(x))
+    ax.set_xlabel(xlabel, fontweight='bold', color='white')
+    ax.set_ylabel('Total Penjualan', fontweight='bold', color='white')
+
+    ax.yaxis.set_major_formatter(FuncFormatter(axis_formatter))
+    ax.tick_params(axis='x', colors='white')
+    ax.tick_params(axis='y', colors='white')
+
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    plt.grid(visible=True, which='major', axis='y', color='gray', linestyle='--', alpha=0.7)
+
+    # Background transparan
+    fig.patch.set_alpha(0)
+    ax.set_facecolor("none")
+
+    return fig
+
+## DataFrame penjualan produk per kategori
+def create_product_sales_df(data_df, ascending=False, n=5):
+    data = (
+        data_df
+        .rename(columns={'product_category_name_english': 'product_category'})
+        .groupby('product_category')
+        .size()
+        .reset_index(name='quantity')
+        .sort_values(by='quantity', ascending=ascending)
+        .head(n)
+    )
+
+    return data
+
+## Visualisasi penjualan produk
+def plot_product_sales(data_df, ascending=False):
+    return plot_product_quantity(create_product_sales_df(data_df, ascending=ascending))
+
+## Visualisasi jumlah terjual per kategori (kolom product_category, quantity)
+def plot_product_quantity(data):
+    fig, ax = plt.subplots(figsize=(10, 4))
+
+    colors = ["#6EC6BF", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3"]
+
+    sns.barplot(
+        data=data,
+        x='quantity',
+        y='product_category',
+        palette=colors,
+        ax=ax
+    )
+
+    ax.xaxis.set_major_formatter(FuncFormatter(axis_formatter))
+    ax.set_xlabel('Jumlah Terjual', fontsize=12, fontweight='bold', color='white')
+    ax.set_ylabel('Kategori Produk', fontsize=12, fontweight='bold', color='white')
+    ax.tick_params(axis='x', colors='white')
+    ax.tick_params(axis='y', colors='white')
+
+    plt.tight_layout()
+    plt.grid(False)
+
+    # Background transparan
+    fig.patch.set_alpha(0)
+    ax.set_facecolor("none")
+
+    return fig
+
+## Analisis RFM
+def analyze_rfm(data_df):
+    snapshot_date = data_df['order_purchase_timestamp'].max() + pd.Timedelta(days=1)
+
+    rfm_df = data_df.groupby('customer_unique_id').agg({
+        'order_purchase_timestamp': lambda x: (snapshot_date - x.max()).days,
+        'order_id': 'nunique',
+        'payment_value': 'sum'
+    }).reset_index()
+
+    rfm_df.columns = ['customer_unique_id', 'recency', 'frequency', 'monetary']
+
+    return bin_rfm(rfm_df)
+
+## Binning nilai RFM
+def bin_rfm(rfm_df):
+    # Binning recency
+    rfm_df['cus_status'] = pd.cut(
+        rfm_df['recency'],
+        bins=[-1, 60, 90, 180, float('inf')],
+        labels=['Active', 'Rarely Active', 'Need to Touch', 'Inactive']
+    )
+
+    # Binning frequency
+    rfm_df['cus_activities'] = pd.cut(
+        rfm_df['frequency'],
+        bins=[-1, 0, 5, 10, float('inf')],
+        labels=['Tidak Pernah', 'Jarang', 'Sering', 'Sangat Sering']
+    )
+
+    # Binning monetray
+    rfm_df['cus_value'] = pd.cut(
+        rfm_df['monetary'],
+        bins=[-1, 100, 500, 1000, float('inf')],
+        labels=['Low', 'Middle-Low', 'Middle-High', 'High']
+    )
+
+    return rfm_df
+
+## Segmentasi Customer based on RFM data
+def create_customer_segment(rfm_df, customers_df):
+    # Scoring
+    rfm_df['cus_status_score'] = rfm_df['cus_status'].map({'Inactive': 1, 'Need to Touch': 2, 'Rarely Active': 3, 'Active': 4})
+    rfm_df['cus_activities_score'] = rfm_df['cus_activities'].map({'Tidak Pernah': 1, 'Jarang': 2, 'Sering': 3, 'Sangat Sering': 4})
+    rfm_df['cus_value_score'] = rfm_df['cus_value'].map({'Low': 1, 'Middle-Low': 2, 'Middle-High': 3, 'High': 4})
+
+    # Ubah tipe data dari object (hasil binning) ke tipe integer
+    rfm_df['cus_status_score'] = rfm_df['cus_status_score'].astype(int)
+    rfm_df['cus_activities_score'] = rfm_df['cus_activities_score'].astype(int)
+    rfm_df['cus_value_score'] = rfm_df['cus_value_score'].astype(int)
+
+    # Total Score
+    rfm_df['cus_rating'] = (
+        rfm_df['cus_status_score'] * 0.2 +
+        rfm_df['cus_activities_score'] * 0.3 +
+        rfm_df['cus_value_score'] * 0.5
+    )
+
+    def customer_segment(row):
+        if row['cus_rating'] > 3.3:
+            return 'Super'
+        elif row['cus_rating'] > 2.3:
+            return 'Regular'
+        elif row['cus_rating'] > 1.3:
+            return 'Potential'
+        else:
+            return 'Risk'
+
+    # Buat segmentasi
+    rfm_df['segment'] = rfm_df.apply(customer_segment, axis=1)
+
+    # Ambil city dan state per customer, hapus duplikat/null hanya jika ada
+    customers = customers_df[['customer_unique_id', 'customer_city', 'customer_state']]
+
+    if any(customers[col].hasnans for col in customers.columns):
+        customers = customers.dropna()
+
+    if not customers['customer_unique_id'].is_unique:
+        customers = customers.drop_duplicates()
+
+    # Ambil hanya segment per customer (tanpa join semua kolom RFM)
+    segment = customers['customer_unique_id'].map(rfm_df.set_index('customer_unique_id')['segment'])
+
+    # Tabel jumlah customer per kota x segment, jumlah per segment diturunkan dari tabel ini
+    city_segment_df = (
+        customers
+        .groupby(['customer_city', segment.rename('segment')])
+        .size()
+        .unstack(fill_value=0)
+    )
+    city_segment_df['total'] = city_segment_df.sum(axis=1)
+
+    return city_segment_df
+
+## Jumlah customer per segment dari tabel kota x segment
+def create_segment_count_df(city_segment_df):
+    data = (
+        city_segment_df
+        .drop(columns='total')
+        .sum()
+        .rename_axis('segment')
+        .reset_index(name='jumlah')
+        .sort_values(by='jumlah', ascending=False)
+    )
+
+    return data
+
+## Visualisasi Distribusi Cluster
+def plot_cluster_customers(city_segment_df):
+    data = create_segment_count_df(city_segment_df)
+
+    fig, ax = plt.subplots(figsize=(10, 4))
+
+    segment_colors = {
+        'Super': "#6EC6BF",
+        'Regular': "#D3D3D3",
+        'Potential': "#FFA500",
+        'Risk': "#F50505"
+    }
+
+    sns.barplot(
+        data=data,
+        x='segment',
+        y='jumlah',
+        palette=segment_colors,
+        ax=ax
+    )
+
+    ax.yaxis.set_major_formatter(FuncFormatter(axis_formatter))
+    ax.set_xlabel('Segment', fontsize=12, fontweight='bold', color='white')
+    ax.set_ylabel('Jumlah Customer', fontsize=12, fontweight='bold', color='white')
+    ax.tick_params(axis='x', colors='white')
+    ax.tick_params(axis='y', colors='white')
+
+    plt.tight_layout()
+    plt.grid(False)
+
+    # Background transparan
+    fig.patch.set_alpha(0)
+    ax.set_facecolor("none")
+
+    return fig
+
+## Visualisasi customer's top city
+def plot_customer_top_city(city_segment_df, n=5):
+    data = (
+        city_segment_df
+        .nlargest(n, 'total')
+        .drop(columns='total')
+        .reset_index()
+        .melt(id_vars='customer_city', var_name='segment', value_name='jumlah')
+        .query('jumlah > 0')
+        .sort_values(by='jumlah', ascending=False)
+    )
+
+    fig, ax = plt.subplots(figsize=(10, 4))
+
+    segment_colors = {
+        'Super': "#6EC6BF",
+        'Regular': "#D3D3D3",
+        'Potential': "#FFA500",
+        'Risk': "#F50505"
+    }
+
+    sns.barplot(
+        data=data,
+        x='customer_city',
+        y='jumlah',
+        hue='segment',
+        palette=segment_colors,
+        ax=ax
+    )
+
+    ax.yaxis.set_major_formatter(FuncFormatter(axis_formatter))
+    ax.set_xlabel('Kota', fontsize=12, fontweight='bold', color='white')
+    ax.set_ylabel('Jumlah Customer', fontsize=12, fontweight='bold', color='white')
+    ax.tick_params(axis='x', colors='white')
+    ax.tick_params(axis='y', colors='white')
+
+    plt.xticks(rotation=10)
+    plt.tight_layout()
+    plt.grid(False)
+
+    # Background transparan
+    fig.patch.set_alpha(0)
+    ax.set_facecolor("none")
+
+    return fig
+
+## Deck dengan JSON tanpa indentasi (pydeck default indent=2)
+class CompactDeck(pdk.Deck):
+    def to_json(self):
+        return json.dumps(self, sort_keys=True, default=default_serialize, separators=(',', ':'))
+
+## Kuantisasi koordinat (lng, lat) ke integer, baris tanpa koordinat dibuang
+def quantize_coords(data_df, precision: int = 3):
+    coords = data_df[['geolocation_lng', 'geolocation_lat']].dropna()
+    quantized = np.round(coords.to_numpy() * 10 ** precision).astype(np.int32)
+
+    return quantized, coords.index
+
+## Kuantisasi koordinat peta dan gabungkan lokasi yang sama dengan bobot
+def encode_map_points(data_df, precision: int = 3):
+    scale = 10 ** precision
+    quantized, _ = quantize_coords(data_df, precision=precision)
+
+    # Gabungkan lng/lat terkuantisasi menjadi satu key int64 agar unique cukup 1D
+    keys = (quantized[:, 0].astype(np.int64) << 32) | (quantized[:, 1].astype(np.int64) & 0xFFFFFFFF)
+    unique_keys, weights = np.unique(keys, return_counts=True)
+
+    x = (unique_keys >> 32).astype(np.int32)
+    y = (unique_keys & 0xFFFFFFFF).astype(np.uint32).view(np.int32)
+
+    return pd.DataFrame({
+        'x': x / scale,
+        'y': y / scale,
+        'w': weights,
+    })
+
+## Peta distribusi lokasi users
+def plot_users_map(customers_df, sellers_df, precision: int = 3):
+    return create_users_map(
+        encode_map_points(customers_df, precision=precision),
+        encode_map_points(sellers_df, precision=precision)
+    )
+
+## Peta dari titik yang sudah di-encode (kolom x, y, w)
+def create_users_map(customers_map, sellers_map):
+    # Seller data, alpha per titik meniru tumpukan titik duplikat (opacity 0.1)
+    n_seller_points = int(sellers_map['w'].sum())
+    sellers_map = sellers_map.assign(
+        a=np.round(255 * (1 - 0.9 ** sellers_map['w'])).astype(int)
+    ).drop(columns='w')
+
+    n_points = int(customers_map['w'].sum())
+
+    if n_points < 1_000:
+        radius = 15_000
+    elif n_points < 50_000:
+        radius = 12_000
+    else:
+        radius = 10_000
+
+    # Customer Layer
+    customer_layer = pdk.Layer(
+        "HexagonLayer",
+        data=customers_map,
+        get_position='[x, y]',
+        get_color_weight='w',
+        color_aggregation='SUM',
+        radius=radius,
+        extruded=False,
+        pickable=True,
+        coverage=0.8,
+        colorRange= [
+            [160, 224, 208, 200], # min semi transparan
+            [125, 206, 196, 230],
+            [110, 198, 191, 255] # max "#6EC6BF"
+        ]
+    )
+
+    # Seller Layer
+    seller_layer = pdk.Layer(
+        "ScatterplotLayer",
+        data=sellers_map,
+        get_position='[x, y]',
+        get_fill_color='[255, 165, 0, a]',
+        get_radius=3000,
+        opacity=1,
+        pickable=True,
+    )
+
+    # View State Brazil
+    view_state = pdk.ViewState(
+        latitude=np.average(customers_map['y'], weights=customers_map['w']) if n_points else np.nan,
+        longitude=np.average(customers_map['x'], weights=customers_map['w']) if n_points else np.nan,
+        zoom=5,
+        pitch=0,
+    )
+
+    # Deck Object
+    deck = CompactDeck(
+        layers=[customer_layer, seller_layer],
+        initial_view_state=view_state,
+        map_style="light"
+    )
+
+    # Ukuran payload JSON yang dikirim ke browser
+    map_stats = {
+        'n_points': n_points + n_seller_points,
+        'n_encoded': len(customers_map) + len(sellers_map),
+        'payload_kb': len(deck.to_json().encode()) / 1024,
+    }
+
+    return deck, map_stats
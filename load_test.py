@@ -0,0 +1,355 @@
+"""Load test untuk dashboard.py dengan banyak sesi simultan.
+
+Setiap level N menjalankan server ``streamlit run --server.headless`` baru,
+lalu N client websocket terhubung bersamaan seperti N tab browser. Setiap
+sesi membuka dashboard, lalu berulang kali mengganti periode (End Date dan
+Start Date, masing-masing satu rerun). Latensi rerun diukur dari BackMsg
+``rerun_script`` dikirim sampai ``script_finished`` diterima, sehingga
+sudah termasuk perebutan CPU/GIL antar sesi di server. Dilaporkan
+p50/p95/p99 latensi rerun ganti periode, throughput, dan peak RSS proses
+server. Data dibuat secara acak sehingga bisa dijalankan offline.
+
+Sebelum pengukuran, satu sesi warm-up membuka dashboard agar parsing CSV
+(load_data yang di-cache) tidak ikut terukur. Latensi buka halaman pertama
+setiap sesi dilaporkan terpisah (``load_p50``) dari latensi ganti periode.
+
+Dengan ``--chunksize N`` server dijalankan dalam mode streaming dashboard
+(``streamlit run dashboard.py -- --chunksize N``) sehingga kedua mode bisa
+dibandingkan dengan data yang sama.
+
+Pindah tab tidak memicu rerun di Streamlit (semua tab dirender dalam satu
+rerun), jadi tidak disimulasikan terpisah.
+
+Contoh:
+    python load_test.py --sessions 1 2 4 8 --reruns 5
+    python load_test.py --sessions 1 2 4 8 --reruns 5 --chunksize 100000
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from urllib.request import urlopen
+
+import numpy as np
+import pandas as pd
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from tornado.websocket import websocket_connect
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+DASHBOARD_PATH = os.path.join(REPO_DIR, "dashboard.py")
+
+CATEGORIES = [
+    'bed_bath_table', 'health_beauty', 'sports_leisure', 'furniture_decor',
+    'computers_accessories', 'housewares', 'watches_gifts', 'telephony',
+    'garden_tools', 'auto', 'toys', 'cool_stuff', 'perfumery', 'baby',
+]
+
+CITIES = [
+    ('sao paulo', 'SP', -23.55, -46.63),
+    ('rio de janeiro', 'RJ', -22.91, -43.17),
+    ('belo horizonte', 'MG', -19.92, -43.94),
+    ('brasilia', 'DF', -15.79, -47.88),
+    ('curitiba', 'PR', -25.43, -49.27),
+    ('campinas', 'SP', -22.91, -47.06),
+    ('porto alegre', 'RS', -30.03, -51.23),
+    ('salvador', 'BA', -12.97, -38.50),
+]
+
+# PEMBUATAN DATA ----------
+## Buat dataset acak dengan kolom yang dipakai dashboard
+## (missing_rate > 0 mengosongkan sel secara acak, seperti data mentah)
+def generate_dataset(data_dir, n_orders=20_000, seed=42, missing_rate=0.0):
+    rng = np.random.default_rng(seed)
+
+    start = pd.Timestamp("2016-09-01")
+    span_seconds = int((pd.Timestamp("2018-08-31") - start).total_seconds())
+
+    order_id = np.array([f"order_{i:07d}" for i in range(n_orders)])
+    n_customers = max(n_orders * 9 // 10, 1)
+    customer_idx = rng.integers(0, n_customers, n_orders)
+    purchase = start + pd.to_timedelta(rng.integers(0, span_seconds, n_orders), unit="s")
+    delivered = purchase + pd.to_timedelta(rng.integers(1, 40, n_orders), unit="D")
+    estimated = purchase + pd.to_timedelta(rng.integers(10, 35, n_orders), unit="D")
+    status = rng.choice(['delivered', 'shipped', 'canceled'], n_orders, p=[0.95, 0.03, 0.02])
+    delivered = delivered.where(status == 'delivered')
+    city_idx = rng.integers(0, len(CITIES), n_customers)
+
+    # Satu order bisa punya beberapa item
+    items = rng.integers(1, 4, n_orders)
+    rows = np.repeat(np.arange(n_orders), items)
+
+    sales_df = pd.DataFrame({
+        'order_id': order_id[rows],
+        'customer_id': [f"cus_{i:07d}" for i in customer_idx[rows]],
+        'order_status': status[rows],
+        'order_purchase_timestamp': purchase[rows],
+        'order_delivered_customer_date': delivered[rows],
+        'order_estimated_delivery_date': estimated[rows],
+        'payment_value': rng.gamma(2.0, 80.0, len(rows)).round(2),
+        'review_score': rng.integers(1, 6, len(rows)),
+        'product_category_name_english': rng.choice(CATEGORIES, len(rows)),
+    })
+
+    cities = [CITIES[i] for i in city_idx[customer_idx]]
+    customers_df = pd.DataFrame({
+        'customer_id': [f"cus_{i:07d}" for i in customer_idx],
+        'customer_unique_id': [f"uniq_{i:07d}" for i in customer_idx],
+        'customer_city': [c[0] for c in cities],
+        'customer_state': [c[1] for c in cities],
+        'order_id': order_id,
+        'order_purchase_timestamp': purchase,
+        'payment_value': sales_df.groupby('order_id', sort=True)['payment_value'].sum().to_numpy(),
+        'geolocation_lat': np.array([c[2] for c in cities]) + rng.normal(0, 0.3, n_orders).round(3),
+        'geolocation_lng': np.array([c[3] for c in cities]) + rng.normal(0, 0.3, n_orders).round(3),
+    })
+
+    n_sellers = max(n_orders // 30, 1)
+    seller_idx = rng.integers(0, n_sellers, n_orders)
+    seller_city = [CITIES[i % len(CITIES)] for i in seller_idx]
+    sellers_df = pd.DataFrame({
+        'seller_id': [f"seller_{i:05d}" for i in seller_idx],
+        'order_id': order_id,
+        'order_purchase_timestamp': purchase,
+        'geolocation_lat': np.array([c[2] for c in seller_city]) + rng.normal(0, 0.3, n_orders).round(3),
+        'geolocation_lng': np.array([c[3] for c in seller_city]) + rng.normal(0, 0.3, n_orders).round(3),
+    })
+
+    if missing_rate > 0:
+        sales_df, customers_df, sellers_df = (
+            df.mask(rng.random(df.shape) < missing_rate)
+            for df in (sales_df, customers_df, sellers_df)
+        )
+
+    sales_df.to_csv(os.path.join(data_dir, 'sales_data.csv'), index=False)
+    customers_df.to_csv(os.path.join(data_dir, 'customers_data.csv'), index=False)
+    sellers_df.to_csv(os.path.join(data_dir, 'sellers_data.csv'), index=False)
+
+# SERVER ----------
+## Cari port kosong untuk server Streamlit
+def find_free_port():
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+## Jalankan dashboard dengan streamlit run headless dari folder data
+def start_server(data_dir, port, chunksize=None, timeout=60):
+    command = [
+        sys.executable, "-m", "streamlit", "run", DASHBOARD_PATH,
+        "--server.headless", "true",
+        "--server.port", str(port),
+        "--browser.gatherUsageStats", "false",
+    ]
+    if chunksize:
+        command += ["--", "--chunksize", str(chunksize)]
+
+    server = subprocess.Popen(
+        command,
+        cwd=data_dir,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server Streamlit berhenti dengan kode {server.returncode}")
+        try:
+            with urlopen(f"http://localhost:{port}/_stcore/health", timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.2)
+
+    server.kill()
+    raise RuntimeError("Server Streamlit tidak siap dalam batas waktu")
+
+## Peak RSS proses server (VmHWM, hanya tersedia di Linux)
+def get_peak_rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+
+    return float('nan')
+
+# SIMULASI SESI ----------
+## Satu koneksi websocket seperti satu tab browser
+class DashboardSession:
+    def __init__(self, port):
+        self.url = f"ws://localhost:{port}/_stcore/stream"
+        self.ws = None
+        self.date_inputs = {}
+        self.date_range = None
+
+    async def connect(self):
+        self.ws = await websocket_connect(self.url, subprotocols=["streamlit"])
+
+    def close(self):
+        self.ws.close()
+
+    ## Kirim rerun dengan nilai date input, tunggu sampai script selesai
+    async def rerun(self, dates=None):
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        for label, value in (dates or {}).items():
+            widget = msg.rerun_script.widget_states.widgets.add()
+            widget.id = self.date_inputs[label]
+            widget.string_array_value.data.append(value.strftime("%Y/%m/%d"))
+
+        started = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+
+        while True:
+            raw = await self.ws.read_message()
+            if raw is None:
+                raise RuntimeError("Koneksi websocket terputus")
+
+            forward_msg = ForwardMsg()
+            forward_msg.ParseFromString(raw)
+            msg_type = forward_msg.WhichOneof("type")
+
+            if msg_type == "delta" and forward_msg.delta.WhichOneof("type") == "new_element":
+                element = forward_msg.delta.new_element
+                if element.WhichOneof("type") == "date_input":
+                    date_input = element.date_input
+                    self.date_inputs[date_input.label] = date_input.id
+                    self.date_range = (
+                        datetime.strptime(date_input.min, "%Y/%m/%d").date(),
+                        datetime.strptime(date_input.max, "%Y/%m/%d").date(),
+                    )
+                elif element.WhichOneof("type") == "exception":
+                    raise RuntimeError(element.exception.message)
+
+            elif msg_type == "script_finished":
+                if forward_msg.script_finished != ForwardMsg.FINISHED_SUCCESSFULLY:
+                    raise RuntimeError(f"Script selesai dengan status {forward_msg.script_finished}")
+                return time.perf_counter() - started
+
+## Satu sesi: buka dashboard, lalu ganti periode beberapa kali
+async def run_session(session_id, port, n_reruns, load_latencies, latencies, seed):
+    rng = random.Random(seed + session_id)
+    session = DashboardSession(port)
+    await session.connect()
+
+    try:
+        load_latencies.append(await session.rerun())
+
+        min_date, max_date = session.date_range
+        span_days = (max_date - min_date).days
+        dates = {"Start Date": min_date, "End Date": max_date}
+
+        for _ in range(n_reruns):
+            start_offset = rng.randint(0, span_days - 1)
+            end_offset = rng.randint(start_offset + 1, span_days)
+            new_dates = {
+                "Start Date": min_date + timedelta(days=start_offset),
+                "End Date": min_date + timedelta(days=end_offset),
+            }
+
+            # Urutan ganti input dipilih agar Start Date tidak pernah melewati End Date
+            if new_dates["End Date"] >= dates["Start Date"]:
+                order = ["End Date", "Start Date"]
+            else:
+                order = ["Start Date", "End Date"]
+
+            for label in order:
+                dates[label] = new_dates[label]
+                latencies.append(await session.rerun(dates))
+    finally:
+        session.close()
+
+## Buka dashboard sekali agar cache data sudah terisi sebelum pengukuran
+async def warm_up(port):
+    session = DashboardSession(port)
+    await session.connect()
+
+    try:
+        await session.rerun()
+    finally:
+        session.close()
+
+## Jalankan N sesi bersamaan terhadap satu server baru
+def run_level(n_sessions, n_reruns, data_dir, seed, chunksize=None):
+    port = find_free_port()
+    server = start_server(data_dir, port, chunksize=chunksize)
+
+    load_latencies = []
+    latencies = []
+    errors = []
+
+    async def session(session_id):
+        try:
+            await run_session(session_id, port, n_reruns, load_latencies, latencies, seed)
+        except Exception as e:
+            errors.append(repr(e))
+
+    async def run_sessions():
+        await asyncio.gather(*(session(i) for i in range(n_sessions)))
+
+    try:
+        asyncio.run(warm_up(port))
+
+        started = time.perf_counter()
+        asyncio.run(run_sessions())
+        elapsed = time.perf_counter() - started
+        peak_rss_mb = get_peak_rss_mb(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+
+    return {
+        'sessions': n_sessions,
+        'load_p50': np.percentile(load_latencies, 50) if load_latencies else float('nan'),
+        'reruns': len(latencies),
+        'p50': np.percentile(latencies, 50) if latencies else float('nan'),
+        'p95': np.percentile(latencies, 95) if latencies else float('nan'),
+        'p99': np.percentile(latencies, 99) if latencies else float('nan'),
+        'throughput': (len(load_latencies) + len(latencies)) / elapsed,
+        'peak_rss_mb': peak_rss_mb,
+        'errors': errors,
+    }
+
+## Setiap level N memakai server baru agar cache dan peak RSS tidak tercampur
+def run_load_test(levels, n_reruns, data_dir, seed=42, chunksize=None):
+    results = [run_level(n_sessions, n_reruns, data_dir, seed, chunksize) for n_sessions in levels]
+    return pd.DataFrame(results)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load test rerun dashboard dengan banyak sesi.")
+    parser.add_argument("--sessions", nargs="+", type=int, default=[1, 2, 4, 8], help="Jumlah sesi simultan per level")
+    parser.add_argument("--reruns", type=int, default=5, help="Jumlah perubahan periode per sesi")
+    parser.add_argument("--orders", type=int, default=20_000, help="Jumlah order pada data acak")
+    parser.add_argument("--data-dir", default=None, help="Folder data; jika kosong data acak dibuat di folder sementara")
+    parser.add_argument("--chunksize", type=int, default=None, help="Jalankan dashboard dalam mode streaming dengan chunk sebesar ini")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = args.data_dir
+        if data_dir is None:
+            data_dir = tmp_dir
+            generate_dataset(data_dir, n_orders=args.orders, seed=args.seed)
+
+        results_df = run_load_test(args.sessions, args.reruns, os.path.abspath(data_dir), seed=args.seed, chunksize=args.chunksize)
+
+    errors = results_df.pop('errors')
+    print(results_df.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+
+    for n_sessions, level_errors in zip(results_df['sessions'], errors):
+        for error in level_errors:
+            print(f"[N={n_sessions}] {error}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
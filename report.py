@@ -0,0 +1,300 @@
+"""Batch report generator untuk dashboard E-Commerce OB.
+
+Menghasilkan KPI, tren penjualan, kategori produk terlaris/kurang laris,
+jumlah customer per segment, dan chart PNG untuk banyak periode sekaligus
+tanpa membuka Streamlit.
+
+Contoh:
+    python report.py --freq M Q
+    python report.py --range 2017-01-01 2017-03-31 --range 2018-01-01 2018-06-30
+    python report.py --freq M --chunksize 100000
+"""
+import argparse
+import json
+import math
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+
+import matplotlib
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from helpers import (
+    load_dataset,
+    create_calendar,
+    add_day_id,
+    filter_data,
+    create_sales_kpi,
+    create_sales_trend_df,
+    create_product_sales_df,
+    sales_trend_viz,
+    plot_product_quantity,
+    analyze_rfm,
+    create_customer_segment,
+    create_segment_count_df,
+    plot_cluster_customers,
+    plot_customer_top_city,
+)
+from streaming import stream_daily_rollups
+
+TREND_PERIODS = {
+    'Y': "Tahun",
+    'Q': "Quarter",
+    'M': "Bulan",
+    'W': "Minggu",
+}
+
+# Data bersama untuk setiap worker, diisi sekali oleh init_worker
+# (mode streaming: kalender dan rollup per hari)
+_DATA = {}
+
+## Load semua dataset yang dipakai dashboard beserta tabel kalender
+def load_data(data_dir):
+    data = {
+        'sales': load_dataset(os.path.join(data_dir, 'sales_data.csv')),
+        'customers': load_dataset(os.path.join(data_dir, 'customers_data.csv')),
+        'sellers': load_dataset(os.path.join(data_dir, 'sellers_data.csv')),
+    }
+
+    data['calendar'] = create_calendar(
+        data['sales']['order_purchase_timestamp'].min(),
+        data['sales']['order_purchase_timestamp'].max()
+    )
+
+    for key in ('sales', 'customers', 'sellers'):
+        add_day_id(data[key], data['calendar'])
+
+    return data
+
+## Mode streaming: baca setiap CSV sekali menjadi rollup per hari
+def load_stream_data(data_dir, chunksize):
+    rollups = stream_daily_rollups(data_dir, chunksize=chunksize)
+
+    return {
+        'calendar': rollups.calendar_df,
+        'rollups': rollups,
+    }
+
+## Buat daftar periode dari tanggal min/max data
+def generate_periods(min_date, max_date, freqs):
+    periods = []
+    for freq in freqs:
+        for period in pd.period_range(min_date, max_date, freq=freq):
+            start_date = period.start_time.date()
+            end_date = period.end_time.date()
+
+            # Nama periode mingguan (mis. 2016-12-26/2017-01-01) berisi '/',
+            # pakai format rentang tanggal agar tidak menjadi folder bertingkat
+            name = str(period)
+            if '/' in name or os.sep in name:
+                name = f"{start_date}_{end_date}"
+
+            periods.append((name, start_date, end_date))
+
+    return periods
+
+## Simpan figure ke PNG
+def save_figure(fig, path):
+    fig.savefig(path, dpi=100)
+    plt.close(fig)
+
+## Konversi tipe numpy agar bisa ditulis ke JSON
+def to_builtin(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Tipe {type(value).__name__} tidak bisa ditulis ke JSON")
+
+## Ganti NaN/inf dengan None agar summary.json tetap JSON yang valid
+def to_json_safe(value):
+    if isinstance(value, dict):
+        return {key: to_json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json_safe(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+def init_worker(data):
+    _DATA.clear()
+    _DATA.update(data)
+
+## Hitung isi laporan dari data yang sudah dimuat
+def create_report_data(start_date, end_date):
+    calendar_df = _DATA['calendar']
+    filtered_sales_df = filter_data(_DATA['sales'], start_date, end_date, calendar_df)
+    filtered_customers_df = filter_data(_DATA['customers'], start_date, end_date, calendar_df)
+    filtered_sellers_df = filter_data(_DATA['sellers'], start_date, end_date, calendar_df)
+
+    report_data = {
+        'total_customers': filtered_customers_df['customer_unique_id'].nunique(),
+        'total_sellers': filtered_sellers_df['seller_id'].nunique(),
+        'has_sales': not filtered_sales_df.empty,
+        'has_customers': not filtered_customers_df.empty,
+    }
+
+    if report_data['has_sales']:
+        report_data['kpi'] = create_sales_kpi(filtered_sales_df)
+        report_data['sales_trend'] = {
+            periode: create_sales_trend_df(filtered_sales_df, periode=periode, calendar_df=calendar_df)
+            for periode in TREND_PERIODS
+        }
+        report_data['top_categories'] = create_product_sales_df(filtered_sales_df, ascending=False)
+        report_data['bottom_categories'] = create_product_sales_df(filtered_sales_df, ascending=True)
+
+    if report_data['has_customers']:
+        rfm_df = analyze_rfm(filtered_customers_df)
+        report_data['segment'] = create_customer_segment(rfm_df, filtered_customers_df)
+
+    return report_data
+
+## Hitung isi laporan dengan memotong rollup per hari
+def create_stream_report_data(start_date, end_date):
+    aggregates = _DATA['rollups'].period(start_date, end_date)
+
+    report_data = {
+        'total_customers': aggregates.customers.total_customers,
+        'total_sellers': aggregates.total_sellers,
+        'has_sales': not aggregates.sales.daily.empty,
+        'has_customers': aggregates.customers.total_customers > 0,
+    }
+
+    if report_data['has_sales']:
+        report_data['kpi'] = aggregates.sales.sales_kpi()
+        report_data['sales_trend'] = {
+            periode: aggregates.sales.sales_trend_df(periode)
+            for periode in TREND_PERIODS
+        }
+        report_data['top_categories'] = aggregates.sales.product_sales_df(ascending=False)
+        report_data['bottom_categories'] = aggregates.sales.product_sales_df(ascending=True)
+
+    if report_data['has_customers']:
+        report_data['segment'] = aggregates.customers.customer_segment()
+
+    return report_data
+
+## Isi summary.json dari hasil hitung satu periode
+def create_summary(name, start_date, end_date, report_data):
+    summary = {
+        'period': name,
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'total_customers': report_data['total_customers'],
+        'total_sellers': report_data['total_sellers'],
+    }
+
+    if not report_data['has_sales']:
+        summary['kpi'] = None
+    else:
+        summary['kpi'] = asdict(report_data['kpi'])
+        summary['sales_trend'] = {
+            periode: report_data['sales_trend'][periode].to_dict(orient='records')
+            for periode in TREND_PERIODS
+        }
+        summary['top_categories'] = report_data['top_categories'].to_dict(orient='records')
+        summary['bottom_categories'] = report_data['bottom_categories'].to_dict(orient='records')
+
+    if report_data['has_customers']:
+        summary['segment_counts'] = create_segment_count_df(report_data['segment']).to_dict(orient='records')
+
+    return to_json_safe(summary)
+
+## Hitung isi laporan satu periode sesuai mode data yang dimuat
+def compute_report_data(start_date, end_date):
+    if 'rollups' in _DATA:
+        return create_stream_report_data(start_date, end_date)
+    return create_report_data(start_date, end_date)
+
+## Buat laporan untuk satu periode
+def build_report(name, start_date, end_date, output_dir):
+    report_dir = os.path.join(output_dir, name)
+    os.makedirs(report_dir, exist_ok=True)
+
+    report_data = compute_report_data(start_date, end_date)
+    summary = create_summary(name, start_date, end_date, report_data)
+
+    if report_data['has_sales']:
+        # Tren penjualan
+        for periode, xlabel in TREND_PERIODS.items():
+            trend_df = report_data['sales_trend'][periode]
+            save_figure(
+                sales_trend_viz(trend_df['order_purchase_timestamp'], trend_df['total_sales'], xlabel=xlabel),
+                os.path.join(report_dir, f"sales_trend_{periode}.png")
+            )
+
+        # Produk terlaris dan kurang laris
+        save_figure(plot_product_quantity(report_data['top_categories']), os.path.join(report_dir, "top_products.png"))
+        save_figure(plot_product_quantity(report_data['bottom_categories']), os.path.join(report_dir, "bottom_products.png"))
+
+    if report_data['has_customers']:
+        # Segmentasi customer
+        city_segment_df = report_data['segment']
+        save_figure(plot_cluster_customers(city_segment_df), os.path.join(report_dir, "customer_segment.png"))
+        save_figure(plot_customer_top_city(city_segment_df), os.path.join(report_dir, "top_city.png"))
+
+    with open(os.path.join(report_dir, "summary.json"), "w") as f:
+        json.dump(summary, f, indent=2, allow_nan=False, default=to_builtin)
+
+    return report_dir
+
+## Jalankan semua periode di process pool
+def run_reports(data, periods, output_dir, workers=None):
+    # Dengan start method 'fork' data diwarisi worker tanpa di-pickle ulang
+    methods = mp.get_all_start_methods()
+    ctx = mp.get_context('fork' if 'fork' in methods else None)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=ctx,
+        initializer=init_worker,
+        initargs=(data,)
+    ) as executor:
+        futures = [
+            executor.submit(build_report, name, start_date, end_date, output_dir)
+            for name, start_date, end_date in periods
+        ]
+        return [future.result() for future in futures]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Export laporan dashboard per periode.")
+    parser.add_argument("--data-dir", default=".", help="Folder berisi sales_data.csv, customers_data.csv, dan sellers_data.csv")
+    parser.add_argument("--output-dir", default="reports", help="Folder output laporan")
+    parser.add_argument("--range", nargs=2, action="append", metavar=("START", "END"), help="Periode custom (YYYY-MM-DD YYYY-MM-DD), bisa diulang")
+    parser.add_argument("--freq", nargs="+", default=["M", "Q"], help="Frekuensi periode otomatis dari min/max data (mis. M Q Y)")
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah proses worker")
+    parser.add_argument("--chunksize", type=int, default=None, help="Mode streaming: baca CSV per N baris tanpa memuat seluruh file")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    if args.chunksize:
+        data = load_stream_data(args.data_dir, args.chunksize)
+    else:
+        data = load_data(args.data_dir)
+
+    min_date = data['calendar']['date'].iat[0]
+    max_date = data['calendar']['date'].iat[-1]
+
+    if args.range:
+        periods = []
+        for start, end in args.range:
+            start_date = pd.Timestamp(start).date()
+            end_date = pd.Timestamp(end).date()
+            if start_date > end_date:
+                raise ValueError(f"Start Date tidak boleh lebih besar dari End Date! ({start} > {end})")
+            periods.append((f"{start_date}_{end_date}", start_date, end_date))
+    else:
+        periods = generate_periods(min_date, max_date, args.freq)
+
+    for report_dir in run_reports(data, periods, args.output_dir, workers=args.workers):
+        print(report_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,551 @@
+"""Mode streaming untuk menghitung agregat dashboard dan laporan dari CSV per chunk.
+
+CSV dibaca per ``chunksize`` baris lewat pipeline generator. Dipakai oleh
+report.py (``--chunksize``) dan dashboard.py
+(``streamlit run dashboard.py -- --chunksize N``).
+
+Setiap file dibaca sekali dan dilipat ke rollup dengan kunci ``day_id`` dari
+tabel kalender: agregat harian sales, jumlah per kategori per hari, RFM per
+(customer, hari) (transaksi terakhir, order unik, total pembayaran), lokasi
+customer per hari, pasangan (customer, hari) dan (seller, hari) untuk hitungan
+unik, serta bin peta terkuantisasi per (x, y, hari). Setiap periode cukup
+memotong rollup tersebut dengan ``filter_data`` lalu mengelompokkan ulang.
+
+Tabel mentah tidak pernah dimuat utuh: ``chunksize`` membatasi baris mentah
+di memori, tetapi rollup tetap tumbuh linear terhadap isi file. Peak memory
+kira-kira O(chunksize + order unik + customer-hari + seller-hari + lokasi-hari
++ hari x kategori). Order disimpan sebagai hash uint64 (8 byte per nilai).
+"""
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from helpers import (
+    SalesKPI,
+    NO_DAY_ID,
+    parse_datetime_columns,
+    add_day_id,
+    filter_data,
+    compute_delivery_days,
+    TREND_BUCKETS,
+    create_calendar,
+    create_trend_from_buckets,
+    bin_rfm,
+    create_customer_segment,
+    quantize_coords,
+    create_users_map,
+)
+
+SALES_COLUMNS = [
+    'order_id', 'customer_id', 'order_status', 'order_purchase_timestamp',
+    'order_delivered_customer_date', 'order_estimated_delivery_date',
+    'payment_value', 'review_score', 'product_category_name_english',
+]
+
+CUSTOMERS_COLUMNS = [
+    'customer_unique_id', 'customer_city', 'customer_state', 'order_id',
+    'order_purchase_timestamp', 'payment_value', 'geolocation_lat', 'geolocation_lng',
+]
+
+SELLERS_COLUMNS = [
+    'seller_id', 'order_purchase_timestamp', 'geolocation_lat', 'geolocation_lng',
+]
+
+# PIPELINE CHUNK ----------
+## Baca CSV per chunk hanya untuk kolom yang dibutuhkan
+def read_chunks(path, columns, chunksize):
+    reader = pd.read_csv(path, usecols=lambda col: col in columns, chunksize=chunksize)
+
+    for chunk in reader:
+        yield parse_datetime_columns(chunk)
+
+## Tambahkan day_id ke setiap chunk, lalu filter per periode (jika diberikan)
+def filter_chunks(chunks, calendar_df, start_date=None, end_date=None):
+    for chunk in chunks:
+        add_day_id(chunk, calendar_df)
+
+        if start_date is not None and end_date is not None:
+            chunk = filter_data(chunk, start_date, end_date, calendar_df)
+
+        if not chunk.empty:
+            yield chunk
+
+## Tanggal min/max transaksi tanpa memuat seluruh file
+def stream_date_range(path, chunksize=100_000):
+    min_date, max_date = pd.NaT, pd.NaT
+
+    for chunk in read_chunks(path, ['order_purchase_timestamp'], chunksize):
+        timestamps = chunk['order_purchase_timestamp']
+        min_date = timestamps.min() if pd.isna(min_date) else min(min_date, timestamps.min())
+        max_date = timestamps.max() if pd.isna(max_date) else max(max_date, timestamps.max())
+
+    return min_date, max_date
+
+# AKUMULATOR ----------
+## Hash uint64 per baris (Series atau beberapa kolom) dan mask baris tanpa NaN
+def hash_values(values):
+    if isinstance(values, pd.DataFrame):
+        valid = values.notna().all(axis=1).to_numpy()
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+    else:
+        valid = values.notna().to_numpy()
+        hashes = pd.util.hash_array(values.to_numpy(dtype=object))
+
+    return hashes, valid
+
+## Himpunan hash nilai yang sudah terlihat lintas chunk
+class SeenKeys:
+    # Hash disimpan dalam beberapa array terurut dengan ukuran menurun. Array
+    # baru digabung dengan array terakhir selama tidak lebih kecil, sehingga
+    # setiap hash hanya diurutkan ulang O(log n) kali, bukan di setiap chunk
+    def __init__(self):
+        self.levels = []
+
+    def __len__(self):
+        return sum(len(level) for level in self.levels)
+
+    def contains(self, hashes):
+        found = np.zeros(len(hashes), dtype=bool)
+        for level in self.levels:
+            pos = np.searchsorted(level, hashes).clip(max=len(level) - 1)
+            found |= level[pos] == hashes
+
+        return found
+
+    # Mask baris yang nilainya muncul pertama kali (NaN tidak dihitung)
+    def add(self, values):
+        hashes, valid = hash_values(values)
+
+        new = valid & ~pd.Index(hashes).duplicated() & ~self.contains(hashes)
+
+        level = np.sort(hashes[new])
+        while self.levels and len(self.levels[-1]) <= len(level):
+            level = np.sort(np.concatenate([self.levels.pop(), level]))
+        if len(level):
+            self.levels.append(level)
+
+        return new
+
+## Agregat parsial per chunk yang digabung secara bertahap
+class PartialFrames:
+    # Parsial baru hanya digabung saat jumlah barisnya sudah menyamai hasil
+    # gabungan, sehingga biaya gabung teramortisasi O(1) per baris parsial
+    def __init__(self, merge):
+        self.merge = merge
+        self.merged = None
+        self.parts = []
+        self.n_pending = 0
+
+    def add(self, part):
+        self.parts.append(part)
+        self.n_pending += len(part)
+
+        if self.merged is None or self.n_pending >= len(self.merged):
+            self.result()
+
+    def result(self):
+        if self.parts:
+            frames = self.parts if self.merged is None else [self.merged, *self.parts]
+            self.merged = self.merge(frames)
+            self.parts = []
+            self.n_pending = 0
+
+        return self.merged
+
+## Fungsi penggabung untuk PartialFrames
+def merge_sum(frames):
+    merged = pd.concat(frames)
+    return merged.groupby(level=list(range(merged.index.nlevels))).sum()
+
+def merge_max(frames):
+    merged = pd.concat(frames)
+    return merged.groupby(level=list(range(merged.index.nlevels))).max()
+
+def merge_unique(frames):
+    return pd.concat(frames).drop_duplicates()
+
+def merge_rfm(frames):
+    merged = pd.concat(frames)
+    return merged.groupby(level=list(range(merged.index.nlevels))).agg({
+        'last_purchase': 'max',
+        'frequency': 'sum',
+        'monetary': 'sum'
+    })
+
+## Pasangan (hash nilai, day_id) unik untuk hitungan unik per periode
+class DailyKeys:
+    def __init__(self):
+        self.partials = PartialFrames(merge_unique)
+
+    def add(self, values, day_id):
+        hashes, valid = hash_values(values)
+        pairs = pd.DataFrame({'key': hashes, 'day_id': day_id.to_numpy()})[valid]
+
+        self.partials.add(pairs.drop_duplicates())
+
+    def finish(self):
+        self.partials.result()
+
+    def count(self, start_date, end_date, calendar_df):
+        pairs = self.partials.result()
+        if pairs is None:
+            return 0
+
+        return filter_data(pairs, start_date, end_date, calendar_df)['key'].nunique()
+
+## Bin lokasi peta terkuantisasi per (x, y, day_id)
+class GeoBins:
+    def __init__(self, calendar_df, precision: int = 3):
+        self.calendar_df = calendar_df
+        self.precision = precision
+        self.partials = PartialFrames(merge_sum)
+
+    def add(self, chunk):
+        quantized, index = quantize_coords(chunk, precision=self.precision)
+
+        bins = pd.DataFrame({
+            'x': quantized[:, 0],
+            'y': quantized[:, 1],
+            'day_id': chunk.loc[index, 'day_id'].to_numpy(),
+        }).groupby(['x', 'y', 'day_id']).size()
+
+        self.partials.add(bins)
+
+    def finish(self):
+        self.partials.result()
+
+    # Sama dengan encode_map_points untuk data satu periode (kolom x, y, w)
+    def points(self, start_date, end_date):
+        bins = self.partials.result()
+        if bins is None:
+            return pd.DataFrame({'x': [], 'y': [], 'w': []})
+
+        points = (
+            filter_data(bins.rename('w').reset_index(), start_date, end_date, self.calendar_df)
+            .groupby(['x', 'y'], as_index=False)['w']
+            .sum()
+        )
+        scale = 10 ** self.precision
+
+        return pd.DataFrame({
+            'x': points['x'] / scale,
+            'y': points['y'] / scale,
+            'w': points['w'],
+        })
+
+## Agregat harian dan kategori dari sales_data.csv
+class SalesAccumulator:
+    def __init__(self, calendar_df):
+        self.calendar_df = calendar_df
+        self.daily_partials = PartialFrames(merge_sum)
+        self.category_partials = PartialFrames(merge_sum)
+        self.orders = SeenKeys()
+        self.customers = DailyKeys()
+
+    @property
+    def daily(self):
+        return self.daily_partials.result()
+
+    @property
+    def categories(self):
+        return self.category_partials.result()
+
+    def add(self, chunk):
+        payment = chunk['payment_value']
+        review = chunk['review_score']
+        days_to_delivered, valid_delivered, not_late = compute_delivery_days(chunk)
+
+        # order_purchase_timestamp milik order, jadi semua baris satu order
+        # jatuh di hari yang sama dan order unik bisa dihitung per hari.
+        # Baris tanpa tanggal tidak ikut periode mana pun, jadi order-nya
+        # belum dianggap terlihat
+        valid_day = chunk['day_id'] != NO_DAY_ID
+
+        daily = pd.DataFrame({
+            'day_id': chunk['day_id'],
+            'n_rows': 1,
+            'n_order_rows': chunk['order_id'].notna(),
+            'n_unique_orders': self.orders.add(chunk['order_id'].where(valid_day)),
+            'total_sales': payment.fillna(0),
+            'n_payment': payment.notna(),
+            'n_status_delivered': chunk['order_status'] == 'delivered',
+            'delivery_days_sum': np.where(valid_delivered, days_to_delivered, 0),
+            'n_delivery_days': valid_delivered,
+            'n_not_late': not_late,
+            'review_sum': review.fillna(0),
+            'n_review': review.notna(),
+        }).groupby('day_id').sum()
+
+        self.daily_partials.add(daily)
+        self.category_partials.add(chunk.groupby(['day_id', 'product_category_name_english']).size())
+        self.customers.add(chunk['customer_id'], chunk['day_id'])
+
+    def finish(self):
+        self.daily_partials.result()
+        self.category_partials.result()
+        self.customers.finish()
+
+    ## Potong agregat harian ke satu periode
+    def period(self, start_date, end_date) -> 'SalesPeriod':
+        if self.daily is None:
+            daily = pd.DataFrame(columns=['day_id'])
+            categories = pd.DataFrame(columns=['day_id', 'product_category_name_english', 'quantity'])
+        else:
+            daily = filter_data(self.daily.reset_index(), start_date, end_date, self.calendar_df)
+            categories = filter_data(
+                self.categories.rename('quantity').reset_index(),
+                start_date, end_date, self.calendar_df
+            )
+
+        return SalesPeriod(
+            daily=daily,
+            categories=categories.groupby('product_category_name_english')['quantity'].sum(),
+            n_customers=self.customers.count(start_date, end_date, self.calendar_df),
+            calendar_df=self.calendar_df,
+        )
+
+## Agregat sales untuk satu periode
+@dataclass
+class SalesPeriod:
+    daily: pd.DataFrame
+    categories: pd.Series
+    n_customers: int
+    calendar_df: pd.DataFrame
+
+    def sales_kpi(self) -> SalesKPI:
+        total = self.daily.sum()
+        n_rows = total.get('n_rows', 0) or np.nan
+        total_orders = int(total.get('n_order_rows', 0))
+
+        return SalesKPI(
+            total_sales=float(total.get('total_sales', 0)),
+            avg_sales=total.get('total_sales', 0) / (total.get('n_payment', 0) or np.nan),
+            total_orders=total_orders,
+            order_per_cus=total_orders / (self.n_customers or np.nan),
+            delivery_success_rate=total.get('n_status_delivered', 0) / n_rows * 100,
+            avg_delivery_days=total.get('delivery_days_sum', 0) / (total.get('n_delivery_days', 0) or np.nan),
+            delivery_late_rate=(n_rows - total.get('n_not_late', 0)) / n_rows * 100,
+            avg_review=total.get('review_sum', 0) / (total.get('n_review', 0) or np.nan),
+        )
+
+    # Sama dengan create_sales_trend_df, tetapi dari agregat harian
+    def sales_trend_df(self, periode: str):
+        if periode not in TREND_BUCKETS:
+            raise ValueError("Periode tidak valid!")
+
+        bucket_id = self.calendar_df[f"{TREND_BUCKETS[periode]}_id"].to_numpy()[self.daily['day_id']]
+
+        bucket_df = (
+            self.daily[['n_unique_orders', 'total_sales']]
+            .groupby(bucket_id)
+            .sum()
+            .rename(columns={'n_unique_orders': 'total_orders'})
+            .astype({'total_orders': int})
+        )
+
+        return create_trend_from_buckets(bucket_df, periode, self.calendar_df)
+
+    # Sama dengan create_product_sales_df, tetapi dari jumlah per kategori
+    def product_sales_df(self, ascending=False, n=5):
+        data = (
+            self.categories
+            .astype(int)
+            .rename_axis('product_category')
+            .reset_index(name='quantity')
+            .sort_values(by='quantity', ascending=ascending)
+            .head(n)
+        )
+
+        return data
+
+## Rollup RFM dan lokasi per (customer, hari) dari customers_data.csv
+class CustomerAccumulator:
+    def __init__(self, calendar_df, precision: int = 3):
+        self.calendar_df = calendar_df
+        self.rfm_partials = PartialFrames(merge_rfm)
+        self.location_partials = PartialFrames(merge_unique)
+        self.last_purchase_partials = PartialFrames(merge_max)
+        self.orders = SeenKeys()
+        self.geo = GeoBins(calendar_df, precision=precision)
+
+    @property
+    def rfm(self):
+        return self.rfm_partials.result()
+
+    @property
+    def locations(self):
+        return self.location_partials.result()
+
+    @property
+    def last_purchase(self):
+        return self.last_purchase_partials.result()
+
+    def add(self, chunk):
+        # Baris tanpa tanggal tidak ikut periode mana pun
+        chunk = chunk[chunk['day_id'] != NO_DAY_ID]
+
+        # Order unik dihitung per pasangan (customer, order) seperti
+        # nunique per customer di analyze_rfm; baris tanpa customer dilewati
+        rfm = pd.DataFrame({
+            'customer_unique_id': chunk['customer_unique_id'],
+            'day_id': chunk['day_id'],
+            'last_purchase': chunk['order_purchase_timestamp'],
+            'frequency': self.orders.add(chunk[['customer_unique_id', 'order_id']]),
+            'monetary': chunk['payment_value'],
+        }).set_index(['customer_unique_id', 'day_id'])
+
+        self.rfm_partials.add(merge_rfm([rfm]))
+        self.location_partials.add(
+            chunk[['customer_unique_id', 'customer_city', 'customer_state', 'day_id']].drop_duplicates()
+        )
+
+        # Snapshot RFM memakai transaksi terakhir semua baris, sama dengan analyze_rfm
+        self.last_purchase_partials.add(chunk.groupby('day_id')['order_purchase_timestamp'].max())
+        self.geo.add(chunk)
+
+    def finish(self):
+        self.rfm_partials.result()
+        self.location_partials.result()
+        self.last_purchase_partials.result()
+        self.geo.finish()
+
+    ## Potong rollup ke satu periode lalu kelompokkan ulang per customer
+    def period(self, start_date, end_date) -> 'CustomerPeriod':
+        if self.rfm is None:
+            return CustomerPeriod(
+                rfm=pd.DataFrame(columns=['last_purchase', 'frequency', 'monetary']),
+                locations=pd.DataFrame(columns=['customer_unique_id', 'customer_city', 'customer_state']),
+                snapshot_date=pd.NaT,
+            )
+
+        rfm = (
+            filter_data(self.rfm.reset_index(), start_date, end_date, self.calendar_df)
+            .groupby('customer_unique_id')
+            .agg({
+                'last_purchase': 'max',
+                'frequency': 'sum',
+                'monetary': 'sum'
+            })
+        )
+        locations = (
+            filter_data(self.locations, start_date, end_date, self.calendar_df)
+            .drop(columns='day_id')
+            .drop_duplicates()
+        )
+        last_purchase = filter_data(
+            self.last_purchase.reset_index(), start_date, end_date, self.calendar_df
+        )['order_purchase_timestamp'].max()
+
+        return CustomerPeriod(
+            rfm=rfm,
+            locations=locations,
+            snapshot_date=last_purchase + pd.Timedelta(days=1),
+        )
+
+## RFM dan lokasi customer untuk satu periode
+@dataclass
+class CustomerPeriod:
+    rfm: pd.DataFrame
+    locations: pd.DataFrame
+    snapshot_date: pd.Timestamp
+
+    @property
+    def total_customers(self):
+        return len(self.rfm)
+
+    # Sama dengan analyze_rfm, tetapi dari rollup per customer
+    def rfm_df(self):
+        rfm_df = pd.DataFrame({
+            'customer_unique_id': self.rfm.index,
+            'recency': (self.snapshot_date - self.rfm['last_purchase']).dt.days.to_numpy(),
+            'frequency': self.rfm['frequency'].astype(int).to_numpy(),
+            'monetary': self.rfm['monetary'].to_numpy(),
+        })
+
+        return bin_rfm(rfm_df)
+
+    def customer_segment(self):
+        return create_customer_segment(self.rfm_df(), self.locations)
+
+## Seller unik dan bin peta dari sellers_data.csv
+class SellerAccumulator:
+    def __init__(self, calendar_df, precision: int = 3):
+        self.calendar_df = calendar_df
+        self.sellers = DailyKeys()
+        self.geo = GeoBins(calendar_df, precision=precision)
+
+    def add(self, chunk):
+        self.sellers.add(chunk['seller_id'], chunk['day_id'])
+        self.geo.add(chunk)
+
+    def finish(self):
+        self.sellers.finish()
+        self.geo.finish()
+
+    def total_sellers(self, start_date, end_date):
+        return self.sellers.count(start_date, end_date, self.calendar_df)
+
+# AGREGAT DASHBOARD ----------
+## Agregat untuk satu periode
+@dataclass
+class PeriodAggregates:
+    sales: SalesPeriod
+    customers: CustomerPeriod
+    total_sellers: int
+    customer_points: pd.DataFrame
+    seller_points: pd.DataFrame
+
+    # Sama dengan plot_users_map, tetapi dari bin peta per hari
+    def users_map(self):
+        return create_users_map(self.customer_points, self.seller_points)
+
+## Rollup per hari yang dipakai semua periode
+@dataclass
+class DailyRollups:
+    calendar_df: pd.DataFrame
+    sales: SalesAccumulator
+    customers: CustomerAccumulator
+    sellers: SellerAccumulator
+
+    def period(self, start_date, end_date) -> PeriodAggregates:
+        return PeriodAggregates(
+            sales=self.sales.period(start_date, end_date),
+            customers=self.customers.period(start_date, end_date),
+            total_sellers=self.sellers.total_sellers(start_date, end_date),
+            customer_points=self.customers.geo.points(start_date, end_date),
+            seller_points=self.sellers.geo.points(start_date, end_date),
+        )
+
+## Baca setiap CSV sekali dan lipat ke rollup per hari
+def stream_daily_rollups(data_dir, chunksize=100_000, precision: int = 3):
+    min_date, max_date = stream_date_range(os.path.join(data_dir, 'sales_data.csv'), chunksize=chunksize)
+    calendar_df = create_calendar(min_date, max_date)
+
+    rollups = DailyRollups(
+        calendar_df=calendar_df,
+        sales=SalesAccumulator(calendar_df),
+        customers=CustomerAccumulator(calendar_df, precision=precision),
+        sellers=SellerAccumulator(calendar_df, precision=precision),
+    )
+
+    chunks = read_chunks(os.path.join(data_dir, 'sales_data.csv'), SALES_COLUMNS, chunksize)
+    for chunk in filter_chunks(chunks, calendar_df):
+        rollups.sales.add(chunk)
+
+    chunks = read_chunks(os.path.join(data_dir, 'customers_data.csv'), CUSTOMERS_COLUMNS, chunksize)
+    for chunk in filter_chunks(chunks, calendar_df):
+        rollups.customers.add(chunk)
+
+    chunks = read_chunks(os.path.join(data_dir, 'sellers_data.csv'), SELLERS_COLUMNS, chunksize)
+    for chunk in filter_chunks(chunks, calendar_df):
+        rollups.sellers.add(chunk)
+
+    # Gabungkan parsial yang tersisa agar rollup hanya dibaca setelah ini
+    # (aman dibagi ke banyak worker/periode)
+    rollups.sales.finish()
+    rollups.customers.finish()
+    rollups.sellers.finish()
+
+    return rollups